@@ -0,0 +1,117 @@
+"""Equivalence check between the fast action-selection path and RLlib's official path.
+
+Verifies that _fast_compute_actions agrees with compute_single_action on the pinned
+ray/torch stack: deterministic actions must match exactly across a set of sampled
+states, and the stochastic side must produce matching empirical action frequencies
+on a fixed observation. Run this once on a machine with the training environment
+installed whenever the fast path or the pinned ray version changes, and record the
+result in the corresponding commit.
+"""
+
+import os
+import sys
+
+import gym
+import numpy as np
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import (  # pylint: disable=import-error, wrong-import-position
+    _fast_compute_actions,
+    load_agent_policies,
+    process_observation,
+)
+
+
+# instantiate environment with cooperative reward.
+env = gym.make(
+    "wildfire-v0",
+    max_steps=100,
+    size=17,
+    alpha=0.15,
+    beta=0.9,
+    delta_beta=0.7,
+    num_agents=2,
+    agent_start_positions=((12, 6), (12, 13)),
+    initial_fire_size=3,
+    cooperative_reward=True,
+)
+
+# parameters
+NUM_STATES = 25  # number of sampled states to compare deterministic actions on
+NUM_SAMPLES = 20000  # number of stochastic action draws for the frequency comparison
+FREQUENCY_TOLERANCE = 0.02  # maximum allowed difference in empirical action frequencies
+SHARED_POLICY = True  # whether agents share the same policy
+
+# directories needed to load agent policies
+MODEL_PATH = "exp_results/wildfire/ippo_test_13Aug_run1/ippo_mlp_wildfire/IPPOTrainer_wildfire_wildfire_0d215_00000_0_2024-09-01_23-15-56/checkpoint_001408/checkpoint-1408"
+PARAMS_PATH = "exp_results/wildfire/ippo_test_13Aug_run1/ippo_mlp_wildfire/IPPOTrainer_wildfire_wildfire_0d215_00000_0_2024-09-01_23-15-56/params copy.json"
+
+# choose device on which PyTorch tensors will be allocated
+device = torch.device("cpu")
+
+if __name__ == "__main__":
+    # load agent policies
+    agent_policies = load_agent_policies(
+        MODEL_PATH, PARAMS_PATH, shared_policy=SHARED_POLICY, num_agents=env.num_agents
+    )
+
+    # deterministic side: fast-path actions must match compute_single_action with explore=False on every sampled state
+    for _ in range(NUM_STATES):
+        obs, _ = env.reset()
+        state = torch.tensor(env.get_state(), dtype=torch.float32).to(device)
+        ma_obs = process_observation(obs, device, state)
+        for i in range(env.num_agents):
+            agent_obs = ma_obs[f"{i}"]
+            reference = agent_policies[i].compute_single_action(
+                agent_obs, explore=False
+            )[0]
+            obs_batch = {
+                "obs": agent_obs["obs"].unsqueeze(0),
+                "state": agent_obs["state"].unsqueeze(0),
+            }
+            fast = _fast_compute_actions(
+                agent_policies[i], obs_batch, stochastic_policy=False
+            ).item()
+            assert fast == reference, (
+                f"deterministic mismatch for agent {i}: "
+                f"fast path {fast}, compute_single_action {reference}"
+            )
+    print(
+        f"deterministic check passed: actions match on {NUM_STATES} states "
+        f"for all {env.num_agents} agents"
+    )
+
+    # stochastic side: empirical action frequencies from both paths must agree on a fixed observation
+    obs, _ = env.reset()
+    state = torch.tensor(env.get_state(), dtype=torch.float32).to(device)
+    ma_obs = process_observation(obs, device, state)
+    agent_obs = ma_obs["0"]
+    policy = agent_policies[0]
+    reference_actions = np.array(
+        [policy.compute_single_action(agent_obs)[0] for _ in range(NUM_SAMPLES)]
+    )
+    obs_batch = {
+        "obs": agent_obs["obs"].unsqueeze(0).expand(
+            NUM_SAMPLES, *agent_obs["obs"].shape
+        ),
+        "state": agent_obs["state"].unsqueeze(0).expand(
+            NUM_SAMPLES, *agent_obs["state"].shape
+        ),
+    }
+    fast_actions = (
+        _fast_compute_actions(policy, obs_batch, stochastic_policy=True).cpu().numpy()
+    )
+    num_actions = int(max(reference_actions.max(), fast_actions.max())) + 1
+    reference_freq = np.bincount(reference_actions, minlength=num_actions) / NUM_SAMPLES
+    fast_freq = np.bincount(fast_actions, minlength=num_actions) / NUM_SAMPLES
+    max_diff = np.abs(reference_freq - fast_freq).max()
+    assert max_diff < FREQUENCY_TOLERANCE, (
+        f"stochastic mismatch: empirical action frequencies differ by {max_diff:.4f} "
+        f"(tolerance {FREQUENCY_TOLERANCE}); "
+        f"fast path {fast_freq.tolist()}, compute_single_action {reference_freq.tolist()}"
+    )
+    print(
+        f"stochastic check passed: max frequency difference {max_diff:.4f} "
+        f"over {NUM_SAMPLES} draws (tolerance {FREQUENCY_TOLERANCE})"
+    )
@@ -12,8 +12,7 @@ import torch
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import (  # pylint: disable=import-error, wrong-import-position
-    process_observation,
-    run_episodes,
+    run_episodes_vectorized,
 )
 from wildfire_environment.utils.misc import (  # pylint: disable=wrong-import-position
     get_initial_fire_coordinates,
@@ -86,6 +85,9 @@ if __name__ == "__main__":
     grid_size = env.grid_size
     initial_fire_size = env.initial_fire_size
     mp.set_start_method("spawn")  # set the multiprocessing start method
+    if not USE_LOGS:
+        # create one persistent pool of workers for all initial states. The first task dispatched to each worker loads the checkpoint into its cache, after which all later initial states reuse the resident policies.
+        pool = mp.Pool(processes=NUM_WORKERS)
     # loop over all initial states. (i,j), the initial state identifier is the position of the center cell of the fire square, if it is odd sized. If the fire square is even sized, the top-left corner cell is chosen as the initial state identifier.
     for i in tqdm(range(grid_size), desc="x-coordinate of initial state identifier"):
         for j in tqdm(
@@ -124,28 +126,24 @@ if __name__ == "__main__":
                     grid_size,
                     initial_fire_size,
                 )
-                # reset env to initial state
+                # initial state for all episodes; each worker resets its own environment copies to it
                 initial_state = torch.tensor(
                     env.construct_state(trees_on_fire, env.agent_start_positions, 0),
                     dtype=torch.float32,
                 ).to(device)
-                obs, _ = env.reset(state=initial_state.cpu().numpy())
-                ma_obs = process_observation(obs, device, initial_state)
 
                 # divide sample collection among workers
                 samples_per_worker = [NUM_EPISODES // NUM_WORKERS] * NUM_WORKERS
                 if NUM_EPISODES % NUM_WORKERS != 0:
                     samples_per_worker[-1] += NUM_EPISODES % NUM_WORKERS
-                # collect samples
-                pool = mp.Pool(processes=NUM_WORKERS)
+                # collect samples; each worker advances its episodes in lockstep with one batched policy forward per step
                 collected_samples = pool.starmap(
-                    run_episodes,
+                    run_episodes_vectorized,
                     [
                         (
                             s,
                             env,
                             GAMMA,
-                            ma_obs,
                             initial_state,
                             device,
                             MODEL_PATH,
@@ -157,23 +155,26 @@ if __name__ == "__main__":
                     ],
                 )
 
-                # wait for all processes to finish
-                pool.close()
-                pool.join()
-
-                # create single list containing all episode return samples
-                all_return_samples = [
-                    sample[0]
-                    for worker_samples in collected_samples
-                    for sample in worker_samples
-                ]
+                # create single array containing all episode return samples
+                all_return_samples = np.concatenate(
+                    [returns for returns, _ in collected_samples]
+                )
                 # initial state for all samples
-                initial_state_identifier = f"{collected_samples[0][0][1]}"
+                initial_state_identifier = (
+                    f"{tuple(int(c) for c in collected_samples[0][1][0])}"
+                )
 
                 # calculate Monte Carlo estimate of value function for current initial state
                 value_estimates[initial_state_identifier] = np.mean(all_return_samples)
                 # store return samples for current initial state
-                state_wise_returns[initial_state_identifier] = all_return_samples
+                state_wise_returns[initial_state_identifier] = (
+                    all_return_samples.tolist()
+                )
+
+    if not USE_LOGS:
+        # wait for all processes to finish
+        pool.close()
+        pool.join()
 
     # save experiment data
     with open(f"{results_path}/{RUN}_value_function.json", "w", encoding="utf-8") as fp:
@@ -1,3 +1,6 @@
+import copy
+import functools
+from collections import namedtuple
 from itertools import count
 from tqdm import tqdm
 import torch
@@ -8,6 +11,46 @@ from wildfire_environment.utils.misc import (  # pylint: disable=wrong-import-po
 )
 
 
+# staging buffers reused across steps for host-to-device transfers, keyed by array shape and dtype. Each entry pairs a pinned buffer with the event recorded after its last async transfer.
+_staging_buffers = {}
+
+
+def _stage_to_device(array, device):
+    """Copy a numpy array to the given device in a single transfer.
+
+    On GPU devices the copy is staged through a reusable pinned-memory buffer so the host-to-device transfer can be issued asynchronously. An event recorded after each transfer is synchronized before the buffer is refilled, so a pending transfer is never overwritten. On CPU the array is wrapped without an extra copy.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        array to transfer
+    device : torch.device
+        the device on which the returned tensor will be allocated
+
+    Returns
+    -------
+    torch.Tensor
+        tensor on the given device containing the contents of array
+    """
+    tensor = torch.from_numpy(array)
+    if device.type != "cuda":
+        return tensor
+    key = (array.shape, array.dtype.str)
+    entry = _staging_buffers.get(key)
+    if entry is None:
+        staging = torch.empty_like(tensor, pin_memory=True)
+        event = torch.cuda.Event()
+        _staging_buffers[key] = (staging, event)
+    else:
+        staging, event = entry
+        # wait until the previous transfer out of this buffer has completed before refilling it
+        event.synchronize()
+    staging.copy_(tensor)
+    moved = staging.to(device, non_blocking=True)
+    event.record()
+    return moved
+
+
 def obs_to_torch(ma_obs, device):
     """Converts numpy arrays in ma_obs of RLlibWildfireEnv to torch tensors.
 
@@ -23,12 +66,14 @@ def obs_to_torch(ma_obs, device):
     dict[str, dict[str, torch.Tensor]]
         observation dictionary with torch tensors.
     """
-    for key in ma_obs:
-        obs = ma_obs[key]
-        for key2 in obs:
-            obs[key2] = torch.from_numpy(np.array([obs[key2]])).to(device)
-        ma_obs[key] = obs
-    return ma_obs
+    # build a fresh dictionary in one pass rather than mutating ma_obs while iterating it. The in-place unsqueeze adds the batch dimension without the copy an np.array([...]) wrapper would make.
+    return {
+        key: {
+            key2: torch.from_numpy(value).unsqueeze_(0).to(device)
+            for key2, value in obs.items()
+        }
+        for key, obs in ma_obs.items()
+    }
 
 
 def process_observation(ma_obs, device, state):
@@ -48,9 +93,62 @@ def process_observation(ma_obs, device, state):
     dict[str, dict[str, torch.Tensor]]
         observation dictionary with torch tensors.
     """
-    for key in ma_obs:
-        ma_obs[key] = {"obs": torch.from_numpy(ma_obs[key]).to(device), "state": state}
-    return ma_obs
+    # stack all agent observations into one contiguous array so each step issues a single host-to-device transfer instead of one per agent
+    obs_stack = _stage_to_device(np.stack(list(ma_obs.values())), device)
+    # build a fresh dictionary in one pass rather than mutating ma_obs while iterating it
+    return {key: {"obs": obs_stack[i], "state": state} for i, key in enumerate(ma_obs)}
+
+
+@functools.lru_cache(maxsize=4)
+def _load_ckpt(model_path, params_path):
+    """Load the RLlib checkpoint at the given paths, caching the deserialized trainer.
+
+    run_episodes reloads agent policies on every call, so evaluating a policy at many initial states would deserialize the same checkpoint from disk once per state. Policies are stateless at inference time, which makes it safe to share the trainer across calls; long-running scripts can release cached trainers with _load_ckpt.cache_clear().
+
+    Parameters
+    ----------
+    model_path : str
+        path to the file containing agent policies' models
+    params_path : str
+        path to the params file for the policy training run
+
+    Returns
+    -------
+    Checkpoint
+        the loaded checkpoint containing the saved trainer
+    """
+    return load_model(
+        {
+            "model_path": model_path,
+            "params_path": params_path,
+        }
+    )
+
+
+# struct-of-arrays view of a multi-agent observation: obs is a [num_agents, ...] tensor stacking every agent's observation and state is the shared state tensor
+MAObsView = namedtuple("MAObsView", ["obs", "state"])
+
+
+def process_observation_soa(ma_obs, device, state):
+    """Construct a struct-of-arrays observation view from agent observations of WildfireEnv.
+
+    Struct-of-arrays counterpart of process_observation: instead of one small tensor dictionary per agent, all agent observations live in a single stacked [num_agents, ...] tensor and the state is shared by reference. This drops the per-agent dictionary bookkeeping on every step and feeds the batched action-selection path without restacking.
+
+    Parameters
+    ----------
+    ma_obs : dict[str, np.ndarray]
+        observation dictionary from WildfireEnv. Each key is the agent id and each value is the agent observation (the agent centered toroidal view of grid).
+    device : str
+        the device on which PyTorch tensors will be allocated
+    state : torch.Tensor
+        the state of the environment
+
+    Returns
+    -------
+    MAObsView
+        stacked observation tensor and shared state tensor.
+    """
+    return MAObsView(_stage_to_device(np.stack(list(ma_obs.values())), device), state)
 
 
 def load_agent_policies(
@@ -75,12 +173,7 @@ def load_agent_policies(
         list of agent policies, in order of increasing agent index.
     """
     # get checkpoint containing saved trainer
-    ckpt = load_model(
-        {
-            "model_path": model_path,
-            "params_path": params_path,
-        }
-    )
+    ckpt = _load_ckpt(model_path, params_path)
     # get policies from trainer
     if shared_policy:
         agent_policies = [
@@ -93,38 +186,168 @@ def load_agent_policies(
     return agent_policies
 
 
-def select_action(ma_obs, agent_policies, num_agents, stochastic_policy=False):
+def _fast_compute_actions(policy, obs_batch, stochastic_policy=False):
+    """Sample actions directly from a policy's model and action distribution.
+
+    Bypasses the per-call machinery of RLlib's compute_actions (view-requirement checks, batch preprocessing, action-distribution plumbing and exploration wrapping), which is constant overhead for the fixed-shape wildfire observations. The forward call and distribution construction mirror what compute_actions does internally for these torch policies. Equivalence with the official path is covered by check_fast_action_path.py; rerun it on the pinned ray/torch stack whenever this function or the ray pin changes.
+
+    Parameters
+    ----------
+    policy : TorchPolicy
+        policy whose model and action distribution to use
+    obs_batch : dict[str, torch.Tensor]
+        batched observation dictionary containing "obs" and "state" tensors with a leading batch dimension
+    stochastic_policy : bool, optional
+        whether to sample the action distribution. If False, the deterministic sample is returned, matching compute_actions with explore=False.
+
+    Returns
+    -------
+    torch.Tensor
+        tensor of actions, one per batch row
+    """
+    with torch.no_grad():
+        # normalize observations onto the policy's device, as compute_actions does internally; the restored trainer's models may live on a different device than the rollout tensors
+        obs_batch = {
+            key: value.to(policy.device) for key, value in obs_batch.items()
+        }
+        logits, _ = policy.model({"obs": obs_batch}, [], None)
+        dist = policy.dist_class(logits, policy.model)
+        actions = dist.sample() if stochastic_policy else dist.deterministic_sample()
+    return actions
+
+
+def select_action(
+    ma_obs, agent_policies, num_agents, stochastic_policy=False, agent_keys=None
+):
     """Get action for each agent for given observations and agent policies.
 
+    Agents which share a policy object are served by a single batched compute_actions call instead of one compute_single_action call per agent. This halves the per-step policy dispatch overhead for two agents with a shared policy, and saves more for larger numbers of agents.
+
     Parameters
     ----------
-    ma_obs :dict[str, dict[str, torch.Tensor]]
-        observation dictionary from RLlibWildfireEnv. Each key is the agent id and each value is a dictionary containing agent observation (the agent centered toroidal view of grid) and state.
+    ma_obs : dict[str, dict[str, torch.Tensor]] or MAObsView
+        observation dictionary from RLlibWildfireEnv, where each key is the agent id and each value is a dictionary containing agent observation (the agent centered toroidal view of grid) and state, or the equivalent struct-of-arrays view from process_observation_soa.
     agent_policies : list[TorchPolicy]
         list of agent policies, in order of increasing agent index.
     num_agents : int
         number of agents in the environment
+    agent_keys : list[str], optional
+        agent id keys of ma_obs, in order of increasing agent index. Derived from ma_obs when not given; callers stepping in a hot loop should pass a precomputed list to avoid rebuilding the keys every step.
 
     Returns
     -------
     dict[str, int]
         actions dictionary with agent id as key and agent action as value
     """
-    if stochastic_policy:
-        action = {
-            f"{i}": agent_policies[i].compute_single_action(ma_obs[f"{i}"])[0]
-            for i in range(num_agents)
-        }
-    else:
-        action = {
-            f"{i}": agent_policies[i].compute_single_action(
-                ma_obs[f"{i}"], explore=False
-            )[0]
-            for i in range(num_agents)
-        }
+    soa = isinstance(ma_obs, MAObsView)
+    if agent_keys is None:
+        agent_keys = [str(i) for i in range(num_agents)] if soa else list(ma_obs)
+    # group agents by policy object. With policy sharing enabled there is a single group containing all agents.
+    policy_groups = {}
+    for i in range(num_agents):
+        policy_groups.setdefault(id(agent_policies[i]), []).append(i)
+
+    action = {}
+    for group in policy_groups.values():
+        policy = agent_policies[group[0]]
+        if soa:
+            # slice the already-stacked observation tensor; a full group reuses it outright and the shared state is expanded without a copy
+            obs_batch = {
+                "obs": ma_obs.obs if len(group) == num_agents else ma_obs.obs[group],
+                "state": ma_obs.state.unsqueeze(0).expand(
+                    len(group), *ma_obs.state.shape
+                ),
+            }
+        else:
+            # stack observations of all agents in the group along a new batch dimension. The observations are already torch tensors, so stacking avoids a numpy round-trip.
+            obs_batch = {
+                "obs": torch.stack([ma_obs[agent_keys[i]]["obs"] for i in group]),
+                "state": torch.stack([ma_obs[agent_keys[i]]["state"] for i in group]),
+            }
+        # single forward pass for all agents in the group
+        group_actions = _fast_compute_actions(policy, obs_batch, stochastic_policy)
+        for i, agent_action in zip(group, group_actions.tolist()):
+            action[agent_keys[i]] = agent_action
     return action
 
 
+def _select_actions_batched(
+    ma_obs_list, agent_policies, num_agents, stochastic_policy=False, agent_keys=None
+):
+    """Get actions for every agent in every environment of a batch.
+
+    Extends the policy grouping of select_action across a batch of environments: observations are stacked over both environments and agents, so each policy group is served by a single forward pass regardless of how many environments are in flight.
+
+    Parameters
+    ----------
+    ma_obs_list : list[dict[str, dict[str, torch.Tensor]]] or list[MAObsView]
+        observations, one per environment, as RLlibWildfireEnv-format dictionaries or struct-of-arrays views from process_observation_soa.
+    agent_policies : list[TorchPolicy]
+        list of agent policies, in order of increasing agent index.
+    num_agents : int
+        number of agents in the environment
+    agent_keys : list[str], optional
+        agent id keys of the observation dictionaries, in order of increasing agent index. Derived from the first observation when not given.
+
+    Returns
+    -------
+    list[dict[str, int]]
+        actions dictionaries, one per environment, with agent id as key and agent action as value
+    """
+    soa = isinstance(ma_obs_list[0], MAObsView)
+    if agent_keys is None:
+        agent_keys = (
+            [str(i) for i in range(num_agents)] if soa else list(ma_obs_list[0])
+        )
+    policy_groups = {}
+    for i in range(num_agents):
+        policy_groups.setdefault(id(agent_policies[i]), []).append(i)
+
+    actions = [{} for _ in ma_obs_list]
+    for group in policy_groups.values():
+        policy = agent_policies[group[0]]
+        if soa:
+            obs_batch = {
+                "obs": torch.cat(
+                    [
+                        ma_obs.obs if len(group) == num_agents else ma_obs.obs[group]
+                        for ma_obs in ma_obs_list
+                    ]
+                ),
+                "state": torch.cat(
+                    [
+                        ma_obs.state.unsqueeze(0).expand(
+                            len(group), *ma_obs.state.shape
+                        )
+                        for ma_obs in ma_obs_list
+                    ]
+                ),
+            }
+        else:
+            obs_batch = {
+                "obs": torch.stack(
+                    [
+                        ma_obs[agent_keys[i]]["obs"]
+                        for ma_obs in ma_obs_list
+                        for i in group
+                    ]
+                ),
+                "state": torch.stack(
+                    [
+                        ma_obs[agent_keys[i]]["state"]
+                        for ma_obs in ma_obs_list
+                        for i in group
+                    ]
+                ),
+            }
+        group_actions = _fast_compute_actions(policy, obs_batch, stochastic_policy)
+        flat_actions = iter(group_actions.tolist())
+        for env_actions in actions:
+            for i in group:
+                env_actions[agent_keys[i]] = next(flat_actions)
+    return actions
+
+
 def run_episodes(
     num_episodes,
     env,
@@ -137,6 +360,7 @@ def run_episodes(
     shared_policy,
     stochastic_policy=False,
     estimate_expected_value=False,
+    discount_tolerance=0.0,
 ):
     """Run specified number of Monte Carlo episodes in the environment starting from given state and following given agent policies.
 
@@ -164,45 +388,84 @@ def run_episodes(
         whether policy is stochastic.
     estimate_expected_value : bool, optional
         whether to estimate expected value. If True, the initial state of the environment is sampled uniformly at random from the initial state distribution for each episode. By default False.
+    discount_tolerance : float, optional
+        truncate an episode once the discount factor gamma**t falls below this value, since later rewards contribute at most discount_tolerance times the reward bound to the return. Introduces a bias no larger than that product, so choose it relative to the reward scale. By default 0.0, which never truncates.
 
     Returns
     -------
-    list[tuple[float,tuple[int,int]]]
-        list containing return and initial state identifier for each episode. The initial state identifier is the position of the center cell of the fire square, if it is odd sized. If the fire square is even sized, the top-left corner cell is chosen as the initial state identifier. This identifier is only valid if initial state has a single square fire region. The purpose for saving this identifier is to be able to re-use the return samples to save redundant computational effort in future.
+    tuple[np.ndarray, np.ndarray]
+        array of shape (num_episodes,) containing the return of each episode, and array of shape (num_episodes, 2) containing the initial state identifier of each episode. The initial state identifier is the position of the center cell of the fire square, if it is odd sized. If the fire square is even sized, the top-left corner cell is chosen as the initial state identifier. This identifier is only valid if initial state has a single square fire region. The purpose for saving this identifier is to be able to re-use the return samples to save redundant computational effort in future.
     """
     # load agent policies
     agent_policies = load_agent_policies(
         model_path, params_path, shared_policy=shared_policy, num_agents=env.num_agents
     )
-    # initialize list to store returns
-    episode_returns = []
+    # preallocate result arrays; numpy storage keeps thousands of episode results compact and lets downstream reductions run at C level
+    returns_arr = np.empty(num_episodes, dtype=np.float64)
+    ids_arr = np.empty((num_episodes, 2), dtype=np.int64)
+    # precompute the discount factor table and the agent id keys; both are invariant across episodes
+    discounts = np.power(gamma, np.arange(env.max_steps + 1))
+    agent_keys = [str(agent.index) for agent in env.agents]
+    agent0_key = agent_keys[0]
+    # canonical host-side copy of the initial state, made once so episode boundaries never pull the resident state tensor back to CPU
+    initial_state_np = state.cpu().numpy()
+    if not estimate_expected_value:
+        # every episode starts from the given initial state, so the initial state identifier is loop-invariant; compute it once
+        trees_on_fire = env.get_state_interpretation(
+            initial_state_np, print_interpretation=False
+        )[0]
+        if env.initial_fire_size % 2 == 0:
+            # if fire square is even sized, choose the top-left corner cell as the initial state identifier
+            initial_state_identifier = trees_on_fire[0]
+        else:
+            initial_state_identifier = trees_on_fire[
+                (env.initial_fire_size**2 - 1) // 2
+            ]
+    # persistent state buffer refilled in place each step, staged through pinned host memory when tensors live on GPU. Avoids allocating a new state tensor and setting up a fresh host-to-device copy every step.
+    state_cpu = torch.from_numpy(np.array(env.get_state(), dtype=np.float32))
+    if device.type == "cuda":
+        state_cpu = state_cpu.pin_memory()
+        state_buf = torch.empty_like(state_cpu, device=device)
+    else:
+        state_buf = state_cpu
+    state_np = state_cpu.numpy()
+    # switch to the struct-of-arrays observation layout for the step loop; callers pass the dictionary form produced by process_observation
+    if isinstance(ma_obs, dict):
+        ma_obs = MAObsView(
+            torch.stack([ma_obs[key]["obs"] for key in agent_keys]), state
+        )
     # run episodes
-    for _ in tqdm(range(num_episodes), desc=f"Running {num_episodes} episodes"):
+    for ep in tqdm(range(num_episodes), desc=f"Running {num_episodes} episodes"):
         # initialize return for current episode
         ret = 0
         # run one episode
         for t in count():
+            # truncate once remaining rewards are discounted below the caller's tolerance
+            if discount_tolerance and discounts[t] < discount_tolerance:
+                break
             # step the environment
             ma_action = select_action(
-                ma_obs, agent_policies, env.num_agents, stochastic_policy
+                ma_obs, agent_policies, env.num_agents, stochastic_policy, agent_keys
             )
             next_obs, reward, done, _ = env.step(ma_action)
 
             # update episode return
-            ret += gamma**t * reward[f"{env.agents[0].index}"]
+            ret += discounts[t] * reward[agent0_key]
 
             # check if episode is done
             if done:
                 break
 
-            # process next observation
-            next_state = torch.tensor(env.get_state(), dtype=torch.float32).to(device)
-            ma_obs = process_observation(next_obs, device, next_state)
+            # process next observation, refilling the persistent state buffer in place
+            np.copyto(state_np, env.get_state())
+            if device.type == "cuda":
+                state_buf.copy_(state_cpu, non_blocking=True)
+            ma_obs = process_observation_soa(next_obs, device, state_buf)
         # reset env for next episode
         if estimate_expected_value:
             # store return and initial state for current episode
             trees_on_fire = env.get_state_interpretation(
-                state.cpu().numpy(), print_interpretation=False
+                initial_state_np, print_interpretation=False
             )[0]
             if env.initial_fire_size % 2 == 0:
                 # if fire square is even sized, choose the top-left corner cell as the initial state identifier
@@ -211,29 +474,143 @@ def run_episodes(
                 initial_state_identifier = trees_on_fire[
                     (env.initial_fire_size**2 - 1) // 2
                 ]
-            episode_returns.append((ret, initial_state_identifier))
+            returns_arr[ep] = ret
+            ids_arr[ep] = initial_state_identifier
             # reset env to initial state sampled uniformly at random from initial state distribution
             obs, _ = env.reset()
-            state = torch.tensor(env.get_state(), dtype=torch.float32).to(device)
-            ma_obs = process_observation(obs, device, state)
+            # explicit copy: get_state may return a view of live env state, and this snapshot must stay fixed for the episode
+            initial_state_np = np.array(env.get_state(), dtype=np.float32)
+            state = torch.from_numpy(initial_state_np).to(device)
+            ma_obs = process_observation_soa(obs, device, state)
 
         else:
-            # store return and initial state for current episode
-            trees_on_fire = env.get_state_interpretation(
-                state.cpu().numpy(), print_interpretation=False
-            )[0]
-            if env.initial_fire_size % 2 == 0:
-                # if fire square is even sized, choose the top-left corner cell as the initial state identifier
-                initial_state_identifier = trees_on_fire[0]
-            else:
-                initial_state_identifier = trees_on_fire[
-                    (env.initial_fire_size**2 - 1) // 2
-                ]
-            episode_returns.append((ret, initial_state_identifier))
-            # reset env to specified initial state
-            obs, _ = env.reset(state=state.cpu().numpy())
-            ma_obs = process_observation(obs, device, state)
-    return episode_returns
+            # store return and the precomputed initial state identifier for current episode
+            returns_arr[ep] = ret
+            ids_arr[ep] = initial_state_identifier
+            # reset env to specified initial state using the cached host-side copy
+            obs, _ = env.reset(state=initial_state_np)
+            ma_obs = process_observation_soa(obs, device, state)
+    return returns_arr, ids_arr
+
+
+def run_episodes_vectorized(
+    num_episodes,
+    env,
+    gamma,
+    state,
+    device,
+    model_path,
+    params_path,
+    shared_policy,
+    stochastic_policy=False,
+    num_envs=None,
+):
+    """Run Monte Carlo episodes concurrently across a batch of environment copies.
+
+    Vectorized counterpart of run_episodes for evaluation at a fixed initial state. Episodes are advanced in lockstep: every live environment is stepped each iteration and a single batched policy forward serves all of them, so policy dispatch overhead does not grow with the number of episodes in flight. gym's vector wrappers do not support the wildfire environment API (per-agent observation dictionaries and state-conditioned reset), so environment copies are stepped in-process while the policy forward is batched across environments and agents. Each copy is reseeded from fresh entropy after copying: deepcopy duplicates the source environment's RNG state, and without reseeding every copy would replay the same fire-spread random stream, making the batched episodes correlated rather than independent Monte Carlo samples.
+
+    Parameters
+    ----------
+    num_episodes : int
+        number of Monte Carlo episodes to run
+    env : MultiGridEnv
+        environment in which to run episodes. Copies of this environment are used for the rollouts; the passed instance is not stepped.
+    gamma : int
+        discount factor
+    state : torch.Tensor
+        the initial state of the environment for every episode
+    device : str
+        the device on which PyTorch tensors will be allocated
+    model_path : str
+        path to the file containing agent policies' models
+    params_path : str
+        path to the params file for the policy training run. The file contains a dictionary. The dictionary in file at params_path should not contain the key "callbacks" and corresponding value. A copy of the original params file may be used for this purpose.
+    shared_policy : bool
+        whether policy sharing among agents is enabled
+    stochastic_policy : bool, optional
+        whether policy is stochastic.
+    num_envs : int, optional
+        number of environment copies to step in lockstep. By default min(num_episodes, 64), which keeps the batched-forward win without holding thousands of live copies in memory.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        array of shape (num_episodes,) containing the return of each episode, and array of shape (num_episodes, 2) containing the initial state identifier of each episode, in the same format as run_episodes.
+    """
+    # load agent policies
+    agent_policies = load_agent_policies(
+        model_path, params_path, shared_policy=shared_policy, num_agents=env.num_agents
+    )
+    if num_envs is None:
+        num_envs = min(num_episodes, 64)
+    num_envs = min(num_envs, num_episodes)
+    envs = [copy.deepcopy(env) for _ in range(num_envs)]
+    # reseed each copy from fresh entropy; deepcopy duplicated the source env's RNG state, so without this every copy would draw identical fire-spread randomness
+    for env_copy, env_seed in zip(
+        envs, np.random.SeedSequence().generate_state(num_envs)
+    ):
+        env_copy.seed(int(env_seed))
+
+    # the initial state is fixed, so its identifier is the same for every episode
+    initial_state_np = state.cpu().numpy()
+    trees_on_fire = env.get_state_interpretation(
+        initial_state_np, print_interpretation=False
+    )[0]
+    if env.initial_fire_size % 2 == 0:
+        # if fire square is even sized, choose the top-left corner cell as the initial state identifier
+        initial_state_identifier = trees_on_fire[0]
+    else:
+        initial_state_identifier = trees_on_fire[(env.initial_fire_size**2 - 1) // 2]
+
+    # preallocate result arrays; the initial state is fixed so every row of ids_arr carries the same identifier
+    returns_arr = np.empty(num_episodes, dtype=np.float64)
+    ids_arr = np.empty((num_episodes, 2), dtype=np.int64)
+    ids_arr[:] = initial_state_identifier
+    # precompute the discount factor table and the agent id keys; both are invariant across episodes
+    discounts = np.power(gamma, np.arange(env.max_steps + 1))
+    agent_keys = [str(agent.index) for agent in env.agents]
+    agent0_key = agent_keys[0]
+    progress = tqdm(total=num_episodes, desc=f"Running {num_episodes} episodes")
+    remaining = num_episodes
+    while remaining > 0:
+        batch_size = min(num_envs, remaining)
+        # reset the batch of environments to the initial state
+        ma_obs_batch = []
+        for e in range(batch_size):
+            obs, _ = envs[e].reset(state=initial_state_np)
+            ma_obs_batch.append(process_observation_soa(obs, device, state))
+        returns = np.zeros(batch_size)
+        live = list(range(batch_size))
+        # step all live environments in lockstep with one batched policy forward per iteration
+        for t in count():
+            ma_actions = _select_actions_batched(
+                [ma_obs_batch[e] for e in live],
+                agent_policies,
+                env.num_agents,
+                stochastic_policy,
+                agent_keys,
+            )
+            still_live = []
+            for e, ma_action in zip(live, ma_actions):
+                next_obs, reward, done, _ = envs[e].step(ma_action)
+                returns[e] += discounts[t] * reward[agent0_key]
+                if done:
+                    continue
+                next_state = torch.tensor(
+                    envs[e].get_state(), dtype=torch.float32
+                ).to(device)
+                ma_obs_batch[e] = process_observation_soa(next_obs, device, next_state)
+                still_live.append(e)
+            live = still_live
+            if not live:
+                break
+        offset = num_episodes - remaining
+        returns_arr[offset : offset + batch_size] = returns
+        progress.update(batch_size)
+        remaining -= batch_size
+    progress.close()
+    return returns_arr, ids_arr
+
 
 def generate_time_series(
     num_episodes,
@@ -292,11 +669,15 @@ def generate_time_series(
             env.construct_state(trees_on_fire, env.agent_start_positions, 0),
             dtype=torch.float32,
         ).to(device)
-        obs, _ = env.reset(state=initial_state.cpu().numpy())
+        # host-side copy cached once so per-episode resets avoid a device-to-host transfer
+        initial_state_np = initial_state.cpu().numpy()
+        obs, _ = env.reset(state=initial_state_np)
         ma_obs = process_observation(obs, device, initial_state)
     else:
         obs, _ = env.reset()
-        state = torch.tensor(env.get_state(), dtype=torch.float32).to(device)
+        # host-side copy cached once so per-episode resets avoid a device-to-host transfer. np.array (not asarray) so the snapshot cannot alias live env state.
+        state_np = np.array(env.get_state(), dtype=np.float32)
+        state = torch.from_numpy(state_np).to(device)
         ma_obs = process_observation(obs, device, state)
 
     # load agent policies
@@ -339,10 +720,10 @@ def generate_time_series(
             # check if episode is done
             if done:
                 if initial_state_identifier:
-                    obs, _ = env.reset(state=initial_state.cpu().numpy())
+                    obs, _ = env.reset(state=initial_state_np)
                     ma_obs = process_observation(obs, device, initial_state)
                 else:
-                    obs, _ = env.reset(state=state.cpu().numpy())
+                    obs, _ = env.reset(state=state_np)
                     ma_obs = process_observation(obs, device, state)
                 
                 # add demarcation between episodes
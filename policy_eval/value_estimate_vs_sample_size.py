@@ -128,20 +128,18 @@ if __name__ == "__main__":
     pool.close()
     pool.join()
 
-    # create single list containing all episode return samples
-    all_return_samples = [
-        sample[0] for worker_samples in collected_samples for sample in worker_samples
-    ]
+    # create single array containing all episode return samples
+    all_return_samples = np.concatenate([returns for returns, _ in collected_samples])
     # create single list containing initial states for all samples
     all_initial_states = [
-        f"{sample[1]}"
-        for worker_samples in collected_samples
-        for sample in worker_samples
+        f"{tuple(int(c) for c in identifier)}"
+        for _, identifiers in collected_samples
+        for identifier in identifiers
     ]
     # calculate Monte Carlo estimates of value function for every sample size in sample_size_list
     for sample_size in sample_size_list:
         return_samples = all_return_samples[:sample_size]
-        value_estimates[sample_size] = sum(return_samples) / sample_size
+        value_estimates[sample_size] = return_samples.mean()
         stdevs[sample_size] = np.std(return_samples)
 
     # store experiment data
@@ -153,7 +151,7 @@ if __name__ == "__main__":
     for i, state in enumerate(all_initial_states):
         if state not in state_wise_returns:
             state_wise_returns[state] = []
-        state_wise_returns[state].append(all_return_samples[i])
+        state_wise_returns[state].append(float(all_return_samples[i]))
 
     # save experiment data
     with open(f"{results_path}/{run}_exp_data.json", "w", encoding="utf-8") as fp: